@@ -1,3 +1,3 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from .netfuses import NetworkFuser, convert_graph
+from .netfuses import NetworkFuser, convert_graph, fuse_vectorized
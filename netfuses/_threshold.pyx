@@ -0,0 +1,35 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+compiled thresholding of similarity tiles into preallocated edge buffers,
+so that no python object is created per emitted edge
+"""
+
+
+def emit_edges(const float[:, ::1] S, float t, int[::1] out_r, int[::1] out_c, bint upper=False):
+    """
+    write the row and column index of every entry of S greater than t 
+    into out_r and out_c
+
+    args:
+        :S (np.ndarray) - C-contiguous float32 similarity tile
+        :t (float) - threshold value
+        :out_r, out_c (np.ndarray) - int32 buffers with room for every entry of S
+        :upper (bool) - only consider entries above the diagonal of S
+    returns:
+        :(int) number of pairs written to the buffers
+    raises:
+        :ValueError if the buffers are smaller than S
+    """
+    cdef Py_ssize_t n = S.shape[0], m = S.shape[1]
+    cdef Py_ssize_t i, j, k = 0
+    if out_r.shape[0] < n * m or out_c.shape[0] < n * m:
+        raise ValueError("edge buffers must hold at least {0} pairs".format(n * m))
+
+    with nogil:
+        for i in range(n):
+            for j in range(i + 1 if upper else 0, m):
+                if S[i, j] > t:
+                    out_r[k] = <int>i
+                    out_c[k] = <int>j
+                    k += 1
+    return k
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+GPU version of `fuse_vectorized` for cosine similarity over large sets of node vectors.
+
+`fuse_gpu` computes the similarity matrix in half precision on the GPU with either
+torch or cupy, one (block_size, block_size) tile at a time so that it need not fit in
+GPU memory, and copies only the indices of the pairs above the threshold back to the host.
+Half precision similarities are accurate to about 1e-3, so pairs whose similarity is
+within that of the threshold may be classified differently than by `fuse_vectorized`.
+"""
+import numpy as np
+
+from .netfuses import _graph_from_pairs, _normalize_rows
+__all__ = ["fuse_gpu"]
+
+
+def _torch_pairs(X, t, block_size, device):
+    import torch
+
+    device = torch.device(device)
+    # half precision matmul is not implemented on the cpu by older torch
+    dtype = torch.float32 if device.type == 'cpu' else torch.float16
+    X = torch.from_numpy(X).to(device=device, dtype=dtype)
+    rows, cols = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)]
+    for i in range(0, len(X), block_size):
+        Xi = X[i:i+block_size]
+        for j in range(i, len(X), block_size):
+            mask = (Xi @ X[j:j+block_size].T) > t
+            if i == j:
+                mask.triu_(1)
+            r, c = mask.nonzero(as_tuple=True)
+            rows.append(i + r.cpu().numpy())
+            cols.append(j + c.cpu().numpy())
+    return np.concatenate(rows), np.concatenate(cols)
+
+def _cupy_pairs(X, t, block_size, device):
+    import cupy as cp
+
+    with cp.cuda.Device(device):
+        X = cp.asarray(X, dtype=cp.float16)
+        rows, cols = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)]
+        for i in range(0, len(X), block_size):
+            Xi = X[i:i+block_size]
+            for j in range(i, len(X), block_size):
+                mask = (Xi @ X[j:j+block_size].T) > t
+                if i == j:
+                    mask = cp.triu(mask, 1)
+                r, c = cp.nonzero(mask)
+                rows.append(i + cp.asnumpy(r))
+                cols.append(j + cp.asnumpy(c))
+    return np.concatenate(rows), np.concatenate(cols)
+
+_BACKENDS = {'torch': _torch_pairs, 'cupy': _cupy_pairs}
+
+def fuse_gpu(t, vectors, node_ids, *graphs, backend='torch', block_size=8192, device=None):
+    """
+    fuses the graphs using cosine similarity between node vectors,
+    computed on the GPU
+
+    args:
+        :t (float) - threshold value
+        :vectors (array-like) - (N, d) matrix whose rows are node vectors
+        :node_ids (sequence) - the N nodes corresponding to the rows of `vectors`
+        :*graphs some number of (nx.Graph) - members of 𝒢
+        :backend (str) - 'torch' or 'cupy'
+        :block_size (int) - side length of each tile of the similarity matrix
+        :device - device to compute on; 'cuda' for torch and 0 for cupy by default.
+                  torch also accepts 'cpu', computing in single precision
+    returns:
+        :(nx.Graph) the fused graph
+    raises:
+        :ValueError if `vectors` and `node_ids` differ in length or the backend is unknown
+    """
+    node_ids = list(node_ids)
+    if len(vectors) != len(node_ids):
+        raise ValueError("got {0} vectors for {1} nodes".format(len(vectors), len(node_ids)))
+    if backend not in _BACKENDS:
+        raise ValueError("unknown backend {0!r}".format(backend))
+    if device is None:
+        device = 'cuda' if backend == 'torch' else 0
+
+    # normalize at full precision before casting to half on the device
+    X = _normalize_rows(vectors)
+    rows, cols = _BACKENDS[backend](X, t, block_size, device)
+    return _graph_from_pairs(node_ids, rows, cols, graphs)
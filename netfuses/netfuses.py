@@ -15,35 +15,292 @@ by a parameter to `fuse` called `simfn`. As described in the docstring, `simfn`
 takes as input a source node u, a set of valid analog vertices V, a threshold value t,
 and any other keyword arguments necessary. `simfn` returns all nodes that have 
 a similarity to u greater than t.
+
+When node similarity is the cosine similarity between precomputed node vectors,
+`fuse_vectorized` computes all pairwise similarities at once with a single
+matrix product instead of calling a similarity function for each pair of nodes.
 """
+import functools
+import itertools
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import networkx as nx
-__all__ = ["convert_graph","NetworkFuser"]
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+try:
+    from ._threshold import emit_edges
+except ImportError:
+    # compiled extension not built; fall back to numpy thresholding
+    emit_edges = None
+__all__ = ["convert_graph","NetworkFuser","fuse_vectorized"]
 
 
-def convert_graph(G, Gprime=nx.DiGraph()):
+def convert_graph(G, Gprime=None):
     """
     convert a multigraph to another graph type
     args:
         :G (nx.Graph child) - graph to collapse edges
-        :Gprime (nx.Graph child) - graph to populate; defaults to digraph
+        :Gprime (nx.Graph child) - graph to populate; defaults to a new digraph
     returns:    
         :the newly converted graph
     """
+    if Gprime is None:
+        Gprime = nx.DiGraph()
     Gprime.add_edges_from(G.edges())
     return Gprime 
 
+def _normalize_rows(X):
+    """
+    L2-normalize each row of X so that dot products between rows
+    are cosine similarities
+    args:
+        :X (array-like) - (N, d) matrix of node vectors
+    returns:
+        :(np.ndarray) normalized float32 copy of X
+    """
+    X = np.array(X, dtype=np.float32)
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    # zero vectors are left as is rather than divided by zero
+    norms[norms == 0] = 1
+    X /= norms
+    return X
+
+class _QuantizedRows:
+    """
+    L2-normalized rows of a matrix stored as int8 codes with one symmetric 
+    scale per row, dequantized to float32 one slice at a time
+    """
+    def __init__(self, vectors, block_size=4096):
+        first = np.asarray(vectors[:1], dtype=np.float32)
+        d = first.shape[1] if first.ndim == 2 else 0
+        self.codes = np.empty((len(vectors), d), dtype=np.int8)
+        self.scale = np.empty((len(vectors), 1), dtype=np.float32)
+        # normalize and quantize a block of rows at a time, so that no 
+        # float32 copy of the whole matrix is ever held
+        for start in range(0, len(vectors), block_size):
+            X = _normalize_rows(vectors[start:start+block_size])
+            scale = np.abs(X).max(axis=1, keepdims=True) / 127
+            scale[scale == 0] = 1
+            self.codes[start:start+block_size] = np.round(X / scale)
+            self.scale[start:start+block_size] = scale
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, rows):
+        return self.codes[rows].astype(np.float32) * self.scale[rows]
+
+def _threshold_pairs(X, t, block_size=1024):
+    """
+    find every pair of rows i < j in X with similarity greater than t
+
+    similarities are computed one (block_size, block_size) tile at a time 
+    so that the full N x N similarity matrix is never materialized
+
+    args:
+        :X (np.ndarray) - (N, d) row-normalized matrix
+        :t (float) - threshold value
+        :block_size (int) - side length of each tile of the similarity matrix
+    returns:
+        :(np.ndarray, np.ndarray) - row and column indices of each pair
+    """
+    rows, cols = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)]
+    if emit_edges is not None:
+        # edge buffers large enough for any one tile, reused across tiles
+        size = min(block_size, len(X)) ** 2
+        buf_r, buf_c = np.empty(size, dtype=np.intc), np.empty(size, dtype=np.intc)
+
+    for i in range(0, len(X), block_size):
+        Xi = X[i:i+block_size]
+        for j in range(i, len(X), block_size):
+            S = np.dot(Xi, X[j:j+block_size].T)
+            # only the upper triangle of diagonal tiles is needed
+            if emit_edges is not None:
+                count = emit_edges(S, t, buf_r, buf_c, i == j)
+                r, c = buf_r[:count], buf_c[:count]
+            elif i == j:
+                r, c = np.nonzero(np.triu(S > t, 1))
+            else:
+                r, c = np.nonzero(S > t)
+            rows.append(i + r.astype(np.intp))
+            cols.append(j + c.astype(np.intp))
+    return np.concatenate(rows), np.concatenate(cols)
+
+def _top_k_pairs(X, t, k, budget=2**25, block_size=4096):
+    """
+    find the pairs of rows in X with similarity greater than t, keeping only
+    the k most similar rows to each row
+
+    args:
+        :X (np.ndarray) - (N, d) row-normalized matrix
+        :t (float) - threshold value
+        :k (int) - number of most similar rows kept per row; k < N
+        :budget (int) - bytes of similarities and selection indices held at
+                        once; each row of similarities takes 12N bytes
+        :block_size (int) - number of columns of X multiplied at once
+    returns:
+        :(np.ndarray, np.ndarray) - row and column indices of each pair
+    """
+    # a float32 similarity and an intp index from argpartition per column
+    n_rows = max(1, budget // (len(X) * (4 + np.dtype(np.intp).itemsize)))
+    rows, cols = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)]
+    for start in range(0, len(X), n_rows):
+        Xi = X[start:start+n_rows]
+        block = np.empty((len(Xi), len(X)), dtype=np.float32)
+        # fill the block one column tile at a time, so that only a slice of 
+        # X is ever dequantized
+        for j in range(0, len(X), block_size):
+            block[:, j:j+block_size] = np.dot(Xi, X[j:j+block_size].T)
+        # a node is never among its own top k
+        diag = np.arange(len(block))
+        block[diag, start + diag] = -np.inf
+        # linear time selection of the k largest similarities in each row
+        nbrs = np.argpartition(block, -k, axis=1)[:, -k:]
+        r, c = np.nonzero(np.take_along_axis(block, nbrs, 1) > t)
+        rows.append(start + r)
+        cols.append(nbrs[r, c])
+    return np.concatenate(rows), np.concatenate(cols)
+
+def _similar_pairs(X, t, k=None):
+    """
+    find every pair of rows in X with similarity greater than t
+
+    args:
+        :X (np.ndarray) - (N, d) row-normalized matrix
+        :t (float) - threshold value
+        :k (int) - if given, only the k most similar rows to each row are kept
+    returns:
+        :(np.ndarray, np.ndarray) - row and column indices of each pair; 
+            i < j unless `k` is given
+    raises:
+        :ValueError if k is less than 1
+    """
+    if k is not None and k < 1:
+        raise ValueError("k must be at least 1, got {0}".format(k))
+    if k is None or k >= len(X):
+        return _threshold_pairs(X, t)
+    return _top_k_pairs(X, t, k)
+
+def _graph_from_pairs(node_ids, rows, cols, graphs):
+    """
+    build a fused graph from index pairs into node_ids
+
+    args:
+        :node_ids (list) - node labels indexed by rows and cols
+        :rows, cols (np.ndarray) - indices of analogous nodes
+        :graphs - source graphs whose nodes are also added to the fused graph
+    returns:
+        :(nx.Graph) fused graph with a self loop on every node
+    """
+    union = set(node_ids).union(*map(set, graphs))
+    # fill the adjacency dicts directly instead of going through add_edges_from;
+    # as in networkx, both directions of an edge share one attribute dict
+    adj = {u: {u: {}} for u in union}
+    for i, j in zip(rows.tolist(), cols.tolist()):
+        u, v = node_ids[i], node_ids[j]
+        adj[u][v] = adj[v][u] = adj[u].get(v, {})
+
+    G = nx.Graph()
+    G._node.update((u, {}) for u in union)
+    G._adj.update(adj)
+    return G
+
+def _components(n, rows, cols, n_jobs=None):
+    """
+    label the connected components of the undirected graph on n nodes 
+    with edges (rows[k], cols[k])
+
+    args:
+        :n (int) - number of nodes
+        :rows, cols (np.ndarray) - endpoints of each edge
+        :n_jobs (int) - if given, label components with a parallel union-find
+                        over this many threads (requires numba)
+    returns:
+        :(int) number of components
+        :(np.ndarray) component id of each node; ids are ordered by component size
+    """
+    if n_jobs is None:
+        A = sp.csr_matrix((np.ones(len(rows), dtype=bool), (rows, cols)), shape=(n, n))
+        n_comp, labels = connected_components(A, directed=False)
+    else:
+        from .union_find import parallel_components
+        n_comp, labels = parallel_components(n, rows, cols, n_jobs=n_jobs)
+    # renumber components from smallest to largest
+    order = np.argsort(np.bincount(labels, minlength=n_comp), kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(n_comp)
+    return n_comp, rank[labels]
+
+def _adjacency_pairs(G, node2idx):
+    """
+    integer index pairs for the adjacency of G
+
+    args:
+        :G (nx.Graph child) - graph whose adjacency to index
+        :node2idx (dict) - mapping from node to integer label; nodes of G
+                           missing from it are skipped
+    returns:
+        :(np.ndarray) (M, 2) array of (node2idx[u], node2idx[v]) for each node u
+            of G in node2idx and each neighbor v of u
+    raises:
+        :KeyError if a neighbor of an indexed node is not in node2idx
+    """
+    flat = itertools.chain.from_iterable((node2idx[u], node2idx[v])
+                                         for u, nbrs in G.adjacency() if u in node2idx
+                                         for v in nbrs)
+    return np.fromiter(flat, dtype=np.intp).reshape(-1, 2)
+
+def fuse_vectorized(t, vectors, node_ids, *graphs, k=None, quantize=False):
+    """
+    fuses the graphs using cosine similarity between node vectors
+
+    equivalent to `NetworkFuser.fuse` with a cosine similarity function,
+    but all similarities are computed with one matrix product rather than 
+    one similarity function call per pair of nodes
+
+    args:
+        :t (float) - threshold value
+        :vectors (array-like) - (N, d) matrix whose rows are node vectors
+        :node_ids (sequence) - the N nodes corresponding to the rows of `vectors`
+        :*graphs some number of (nx.Graph) - members of 𝒢 
+        :k (int) - if given, only the k most similar nodes to each node are
+                   considered as its analogs, capping the number of fused edges
+        :quantize (bool) - store the normalized vectors as int8 with one scale
+                           per row, a quarter of the memory of float32 (not
+                           counting `vectors` itself). tiles are dequantized for
+                           the matrix product, so similarities are accurate to
+                           about 1e-2
+    returns:
+        :(nx.Graph) the fused graph
+    raises:
+        :ValueError if `vectors` and `node_ids` differ in length or k is less than 1
+    """
+    node_ids = list(node_ids)
+    if len(vectors) != len(node_ids):
+        raise ValueError("got {0} vectors for {1} nodes".format(len(vectors), len(node_ids)))
+
+    X = _QuantizedRows(vectors) if quantize else _normalize_rows(vectors)
+    rows, cols = _similar_pairs(X, t, k=k)
+    return _graph_from_pairs(node_ids, rows, cols, graphs)
+
 class NetworkFuser:
     """
     Fuses graphs by finding analogs above a given threshold
     using the specified similarity function parameter.
     """
-    def __init__(self, simfn, threshold=0.95):
+    # similarity names with vectorized `fuse` implementations
+    _SPECIALIZED = ('cosine', 'jaccard', 'exact')
+
+    def __init__(self, simfn, threshold=0.95, cache_size=None, symmetric=False):
         """
         constructs the network fuser using the specified
         similarity function and threshold value
 
         args:
-            :simfn (function)
+            :simfn (function or str)
                 determines the similarity between two nodes
                 args:
                     :u - node from a network
@@ -51,15 +308,119 @@ class NetworkFuser:
                     :**kwargs - any keyword arguments necessary
                 returns:
                     :(float) similarity between the two nodes
+                or one of the names below, for which `fuse` computes all 
+                similarities at once instead of calling a function per pair:
+                    :'cosine' - cosine similarity between node vectors, given
+                                to `fuse` as a mapping `vectors` from node to vector
+                    :'jaccard' - jaccard similarity between the neighbor sets of 
+                                 two nodes across the graphs
+                    :'exact' - 1 if two nodes have the same label and 0 otherwise, 
+                               given to `fuse` as a mapping `labels` from node to label
+            :threshold (float) - nodes with similarity above threshold are analogs
+            :cache_size (int) - if given, memoize the similarity of up to this many
+                                pairs of nodes; useful for expensive similarity
+                                functions and repeated fuses
+            :symmetric (bool) - whether simfn(u, v) == simfn(v, u); if so, cached
+                                pairs are stored once in sorted order, so nodes 
+                                must be orderable
+        raises:
+            :ValueError if simfn is an unknown similarity name, or a similarity
+                name is given with cache_size or symmetric, which only apply to
+                similarity functions
         """
+        if isinstance(simfn, str):
+            if simfn not in self._SPECIALIZED:
+                raise ValueError("unknown similarity {0!r}; expected one of {1}".format(
+                    simfn, ", ".join(self._SPECIALIZED)))
+            if cache_size is not None or symmetric:
+                raise ValueError("cache_size and symmetric require a similarity function, "
+                                 "not {0!r}".format(simfn))
 
-        self.similarity_func = simfn
         self.t = threshold
+        self._cache_args = (simfn, cache_size, symmetric)
+        self._sorted_edges = None
+        self._bind_similarity()
+
+    def _bind_similarity(self):
+        simfn, cache_size, symmetric = self._cache_args
+        self.similarity_func = simfn
+        if isinstance(simfn, str):
+            # replace the generic pairwise fuse with a vectorized one
+            self.fuse = getattr(self, '_fuse_' + simfn)
+        elif cache_size is not None:
+            self.similarity_func = self._cached(simfn, cache_size, symmetric)
+
+    def __getstate__(self):
+        # caches are not picklable; worker processes build their own.
+        # workers never read the precomputed pairs, which are O(N²)
+        state = self.__dict__.copy()
+        state['similarity_func'] = None
+        state['_sorted_edges'] = None
+        state.pop('fuse', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bind_similarity()
+
+    @staticmethod
+    def _cached(simfn, cache_size, symmetric):
+        cached = functools.lru_cache(maxsize=cache_size)(simfn)
+        if not symmetric:
+            return cached
+
+        def similarity_func(u, v):
+            # (u, v) and (v, u) share one cache entry
+            return cached(u, v) if u <= v else cached(v, u)
+        similarity_func.cache_info = cached.cache_info
+        return similarity_func
 
     def _above_threshold(self,u,v):
-        return self.similarit_func(u, v) > self.t
+        return self.similarity_func(u, v) > self.t
+
+    def _analogs(self, i, nodes):
+        # local names save attribute lookups in the O(|V|) loop below
+        sim, t, u = self.similarity_func, self.t, nodes[i]
+        # skip u by index rather than copying the nodes without it; identity
+        # checks would not survive pickling nodes to worker processes
+        return [v for j, v in enumerate(nodes) if j != i and sim(u, v) > t]
+
+    def _scores(self, i, nodes, min_threshold):
+        # similarities to the nodes after u only, as in the upper triangle
+        sim, u = self.similarity_func, nodes[i]
+        scores = np.fromiter((sim(u, v) for v in itertools.islice(nodes, i + 1, None)),
+                             dtype=float, count=len(nodes) - i - 1)
+        keep = np.flatnonzero(scores > min_threshold)
+        return i + 1 + keep, scores[keep]
+
+    def _map_rows(self, fn, nodes, n_jobs, backend):
+        """
+        apply fn(i, nodes) to the index i of every node, in parallel if n_jobs is given
+        """
+        if n_jobs is None:
+            return map(fn, range(len(nodes)), itertools.repeat(nodes))
+
+        # spawn rather than fork worker processes; forking once numba, BLAS or
+        # thread pools have started their threads can leave the workers or the
+        # interpreter deadlocked
+        executors = {'thread': ThreadPoolExecutor,
+                     'process': functools.partial(ProcessPoolExecutor,
+                                                  mp_context=multiprocessing.get_context('spawn'))}
+        if backend not in executors:
+            raise ValueError("unknown backend {0!r}".format(backend))
+        workers = None if n_jobs < 1 else n_jobs
+        return self._pool_rows(executors[backend], workers, fn, nodes)
 
-    def fuse(self, *graphs, verbose=0, **kwargs):
+    @staticmethod
+    def _pool_rows(executor, workers, fn, nodes):
+        # rows are independent; yield them in order as the workers finish them,
+        # so the caller inserts edges and reports progress while the rest run
+        with executor(workers) as pool:
+            chunksize = max(1, len(nodes) // (4 * (workers or 8)))
+            yield from pool.map(fn, range(len(nodes)), itertools.repeat(nodes),
+                                chunksize=chunksize)
+
+    def fuse(self, *graphs, verbose=0, n_jobs=None, backend='thread', **kwargs):
         """
         fuses the graphs by proceeding through the NetFUSES algorithm
         
@@ -72,26 +433,166 @@ class NetworkFuser:
 
         args:
             :*graphs some number of (nx.Graph) - members of 𝒢 
-            :verbose: print output every `verbose` steps; not at all for
-                      verbose = None
+            :verbose: print output every `verbose` nodes whose analogs have been
+                      found; not at all for verbose = 0 or None
+            :n_jobs (int) - if given, find the analogs of each node in parallel
+                            over this many workers; all cpus for n_jobs = -1
+            :backend (str) - 'thread' or 'process'; threads suit similarity
+                             functions that release the GIL (e.g. numpy), processes
+                             suit pure python ones but require a picklable simfn
             :**kwargs - passed to the similarity function
+        raises:
+            :ValueError if backend is not 'thread' or 'process'
         """
         union = set().union(*map(set, graphs))
         G = nx.Graph()
         G.add_nodes_from(union)
         G.add_edges_from((u,u) for u in union)
 
-        for i, u in enumerate(list(union), 1):
-            if verbose is not None and i % verbose == 0:
-                print('\r{0}\r{1:5d/{2:5d}, t={3}'.format(80*' ',i,len(union), self.t))
-
-            valid_nodes = union - set([u])
-            analogs = [self._above_threshold(u, v) for v in valid_nodes]
-            G.add_edges_from((u,a) for a in analogs)
+        nodes = list(union)
+        analogs = self._map_rows(self._analogs, nodes, n_jobs, backend)
+        for i, (u, row) in enumerate(zip(nodes, analogs), 1):
+            if verbose and i % verbose == 0:
+                print('\r{0}\r{1:5d}/{2:5d}, t={3}'.format(80*' ',i,len(union), self.t))
+            G.add_edges_from((u, v) for v in row)
 
         return G
 
-    def collapse(self, fuser, *graphs, collapsed=nx.MultiGraph()):
+    def _fuse_cosine(self, *graphs, vectors, k=None, quantize=False, **kwargs):
+        """
+        fuse for simfn='cosine'; see `fuse_vectorized` for `k` and `quantize`.
+        nodes missing from `vectors` have no analogs
+        """
+        union = set().union(*map(set, graphs))
+        node_ids = [u for u in union if u in vectors]
+        if not node_ids:
+            # no node has a vector, so every node is only its own analog
+            return _graph_from_pairs([], np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), graphs)
+        X = np.array([vectors[u] for u in node_ids], dtype=np.float32)
+        return fuse_vectorized(self.t, X, node_ids, *graphs, k=k, quantize=quantize)
+
+    def _fuse_jaccard(self, *graphs, **kwargs):
+        """
+        fuse for simfn='jaccard', with all neighbor set intersections
+        computed by one sparse matrix product
+        """
+        nodes = list(set().union(*map(set, graphs)))
+        node2idx = {u:j for j, u in enumerate(nodes)}
+        n = len(nodes)
+        if self.t < 0:
+            # every pair, including those without common neighbors, is above t
+            rows, cols = np.triu_indices(n, 1)
+            return _graph_from_pairs(nodes, rows, cols, ())
+
+        # binary adjacency of each node's neighbors across all graphs
+        pairs = np.concatenate([np.empty((0, 2), dtype=np.intp)] + 
+                               [_adjacency_pairs(Gi, node2idx) for Gi in graphs])
+        A = sp.csr_matrix((np.ones(len(pairs), dtype=np.int32), (pairs[:, 0], pairs[:, 1])),
+                          shape=(n, n))
+        A.sum_duplicates()
+        A.data[:] = 1
+        degree = np.asarray(A.sum(axis=1)).ravel()
+
+        # only pairs with a common neighbor can have nonzero similarity
+        common = sp.triu(A @ A.T, 1).tocoo()
+        rows, cols, inter = common.row, common.col, common.data
+        jaccard = inter / (degree[rows] + degree[cols] - inter)
+        above = jaccard > self.t
+        return _graph_from_pairs(nodes, rows[above], cols[above], ())
+
+    def _fuse_exact(self, *graphs, labels, **kwargs):
+        """
+        fuse for simfn='exact', bucketing nodes by label so that only
+        nodes with equal labels are ever paired. nodes missing from 
+        `labels` have no analogs
+        """
+        nodes = list(set().union(*map(set, graphs)))
+        if self.t < 0:
+            # dissimilar nodes, at similarity 0, are also above t
+            rows, cols = np.triu_indices(len(nodes), 1)
+            return _graph_from_pairs(nodes, rows, cols, ())
+        if self.t >= 1:
+            return _graph_from_pairs(nodes, np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), ())
+
+        buckets = defaultdict(list)
+        for j, u in enumerate(nodes):
+            if u in labels:
+                buckets[labels[u]].append(j)
+        pairs = np.array([pair for bucket in buckets.values() 
+                          for pair in itertools.combinations(bucket, 2)],
+                         dtype=np.intp).reshape(-1, 2)
+        return _graph_from_pairs(nodes, pairs[:, 0], pairs[:, 1], ())
+
+    def precompute(self, *graphs, min_threshold=-np.inf, n_jobs=None, backend='thread'):
+        """
+        computes the similarity between every pair of nodes once, so that 
+        the graphs can be fused at many thresholds with `fuse_at`.
+        similarity is assumed symmetric, so each unordered pair is
+        evaluated only once
+
+        args:
+            :*graphs some number of (nx.Graph) - members of 𝒢 
+            :min_threshold (float) - pairs with similarity at most min_threshold 
+                                     are discarded; `fuse_at` thresholds must be 
+                                     at least this value
+            :n_jobs (int), backend (str) - as in `fuse`
+        returns:
+            :(list) the nodes of the graphs
+            :(np.ndarray) structured array of pairs with fields 'sim', 'u' and 'v',
+                sorted by decreasing similarity; 'u' < 'v' are indices into
+                the list of nodes
+        raises:
+            :ValueError if backend is not 'thread' or 'process', or the fuser
+                uses a named similarity rather than a function
+        """
+        if isinstance(self.similarity_func, str):
+            raise ValueError("precompute requires a similarity function, not {0!r}".format(
+                self.similarity_func))
+        nodes = list(set().union(*map(set, graphs)))
+        scores = functools.partial(self._scores, min_threshold=min_threshold)
+
+        # rows are filtered against min_threshold as they arrive
+        u, v, sim = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)], [np.empty(0)]
+        for i, (cols, row) in enumerate(self._map_rows(scores, nodes, n_jobs, backend)):
+            u.append(np.full(len(cols), i, dtype=np.intp))
+            v.append(cols)
+            sim.append(row)
+        u, v, sim = np.concatenate(u), np.concatenate(v), np.concatenate(sim)
+
+        order = np.argsort(-sim, kind='stable')
+        edges = np.empty(len(order), dtype=[('sim', float), ('u', np.intp), ('v', np.intp)])
+        edges['sim'], edges['u'], edges['v'] = sim[order], u[order], v[order]
+
+        self._sorted_edges = (nodes, edges, min_threshold)
+        return nodes, edges
+
+    def fuse_at(self, t=None):
+        """
+        fuses the graphs passed to the last call of `precompute` at threshold t,
+        scanning only the precomputed pairs above t
+
+        args:
+            :t (float) - threshold value; defaults to the fuser's threshold
+        returns:
+            :(nx.Graph) the fused graph, as returned by `fuse`
+        raises:
+            :ValueError if `precompute` has not been called, or t is below
+                the `min_threshold` given to it
+        """
+        if self._sorted_edges is None:
+            raise ValueError("fuse_at requires a call to precompute first")
+        nodes, edges, min_threshold = self._sorted_edges
+        t = self.t if t is None else t
+        if t < min_threshold:
+            # pairs between t and min_threshold were discarded
+            raise ValueError("threshold {0} is below the precomputed min_threshold {1}".format(
+                t, min_threshold))
+
+        # pairs are sorted by decreasing similarity; those above t form a prefix
+        cut = np.searchsorted(-edges['sim'], -t, side='left')
+        return _graph_from_pairs(nodes, edges['u'][:cut], edges['v'][:cut], ())
+
+    def collapse(self, fuser, *graphs, collapsed=None, n_jobs=None, weighted=False):
 
         """
         collapse the graph G so that each connected component in G becomes a 
@@ -103,7 +604,14 @@ class NetworkFuser:
         args:
             :fuser (nx.Graph) - the fused graph, output of `self._fuse`
             :*graphs - some number of source graphs that will comprise the final graph
-            :collapsed (nx.Graph child) - the graph to populate
+            :collapsed (nx.Graph child) - the graph to populate; defaults to
+                                          a new multigraph
+            :n_jobs (int) - if given, find components with a parallel union-find 
+                            over this many threads; all cpus for n_jobs = -1.
+                            requires numba
+            :weighted (bool) - draw one edge per pair of components with the number
+                               of edges between them as its 'weight' attribute, 
+                               instead of one parallel edge each
         returns:
             :populated version of `collapsed` containing a mapping
                 from component id -> node under the attribute 'fused_set' 
@@ -112,28 +620,48 @@ class NetworkFuser:
             :AssertionError if graphs is not all nx.Graph children
         """
         assert all(isinstance(g, nx.Graph) for g in graphs)
+        if collapsed is None:
+            collapsed = nx.MultiGraph()
         
-        conn_comps = sorted(nx.connected_component_subgraphs(fuser), key=len)
+        # work in terms of contiguous integer node labels 0..N-1, 
+        # mapping back to the original nodes only for the outputs
+        nodes = list(fuser)
+        node2idx = {u:j for j, u in enumerate(nodes)}
+
+        # label components over the fuser's sparse adjacency matrix
+        edges = _adjacency_pairs(fuser, node2idx)
+        n_comp, labels = _components(len(nodes), edges[:, 0], edges[:, 1], n_jobs=n_jobs)
+        # group node indices by component id
+        members = np.split(np.argsort(labels, kind='stable'),
+                           np.cumsum(np.bincount(labels, minlength=n_comp))[:-1])
 
         # each node in the fused graph is a component in the fuser
-        id2fused_set = dict()
-        node2fuse_id = dict()
-        # add self loops and find node ids
-        for i, component in enumerate(conn_comps):
-            id2fused_set[i] = set(component)
-            node2fuse_id.update(**{u:i for u in component})
-            collapsed.add_node(i)
-            self_loops = []
-            neighbors = []
-            for node in component:
-                for Gi in filter(lambda g: node in g, graphs):
-                    self_loops.extend(n for n in Gi.neighbors(node) if n in component) 
-                    neighbors.extend(Gi.neighbors(node))
-
-            # draw edges between aggregated node sets
-            collapsed.add_edges_from((i, node2fuse_id[u]) for u in neighbors) 
-            # add self loops 
-            collapsed.add_edges_from((i,i) for _ in range(len(self_loops))) 
+        id2fused_set = {i: {nodes[j] for j in idx.tolist()} for i, idx in enumerate(members)}
+        node2fuse_id = dict(zip(nodes, labels.tolist()))
+
+        # each neighbor of each node across the source graphs, as component ids
+        pairs = np.concatenate([np.empty((0, 2), dtype=np.intp)] + 
+                               [_adjacency_pairs(Gi, node2idx) for Gi in graphs])
+        src, dst = labels[pairs[:, 0]], labels[pairs[:, 1]]
+        # neighbors inside the same component also add a self loop
+        loops = src[src == dst]
+
+        src, dst = np.concatenate([src, loops]), np.concatenate([dst, loops])
+
+        collapsed.add_nodes_from(range(n_comp))
+        if collapsed.is_multigraph() and not weighted:
+            # draw edges between aggregated node sets, self loops included
+            collapsed.add_edges_from(zip(src.tolist(), dst.tolist()))
+        else:
+            # parallel edges would be discarded or summed; add each pair once
+            if not collapsed.is_directed():
+                src, dst = np.minimum(src, dst), np.maximum(src, dst)
+            pairs, counts = np.unique(np.stack([src, dst], axis=1), axis=0, return_counts=True)
+            if weighted:
+                collapsed.add_edges_from((i, j, {'weight': w}) 
+                                         for (i, j), w in zip(pairs.tolist(), counts.tolist()))
+            else:
+                collapsed.add_edges_from(map(tuple, pairs.tolist()))
         
-        nx.set_node_attributes(collapsed, 'fused_set', id2fused_set)
+        nx.set_node_attributes(collapsed, id2fused_set, 'fused_set')
         return collapsed, node2fuse_id
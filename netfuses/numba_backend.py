@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+numba-compiled fusing for similarity functions over numeric node attributes.
+
+`fuse_numba` evaluates the similarity of every pair of nodes inside a compiled kernel
+whose outer loop runs in parallel, rather than calling the similarity function from
+python once per pair. Each node is described by a row of a numeric array (for instance
+integer ids of its attributes), and the similarity function is either
+
+- a `numba.njit` function taking two rows and returning a float, or
+- a `numba.cfunc` with signature `cfunc_signature(dtype)`, taking pointers to
+  two rows and the row length.
+
+Kernels for cfunc similarity functions are compiled ahead of time for float64 and int64
+attributes; kernels for njit similarity functions are compiled on first use. Both are
+cached on disk between sessions.
+"""
+import numpy as np
+from numba import cfunc, njit, prange, typeof, types
+
+from .netfuses import _graph_from_pairs
+__all__ = ["cfunc_signature", "fuse_numba"]
+
+
+# attribute types with precompiled cfunc kernels
+_CFUNC_DTYPES = {np.dtype(np.float64): types.float64, np.dtype(np.int64): types.int64}
+
+def cfunc_signature(dtype):
+    """
+    signature of a cfunc similarity function over rows of the given dtype
+    args:
+        :dtype (numba type) - element type of the attribute array; 
+                              `numba.types.float64` or `numba.types.int64`
+    returns:
+        :(numba signature) float64(dtype*, dtype*, intp)
+    raises:
+        :ValueError if dtype is not supported
+    """
+    if dtype not in _CFUNC_DTYPES.values():
+        raise ValueError("cfunc similarity functions must take float64 or int64 rows, got {0}".format(dtype))
+    ptr = types.CPointer(dtype)
+    return types.float64(ptr, ptr, types.intp)
+
+def _cfunc_kernel_signature(dtype):
+    # the type numba infers for any cfunc of this signature
+    @cfunc(cfunc_signature(dtype))
+    def placeholder(a, b, n):
+        return 0.0
+    return types.UniTuple(types.intp[::1], 2)(dtype[:, ::1], types.float64,
+                                              typeof(placeholder.ctypes), types.intp, types.intp)
+
+@njit(cache=True)
+def _block_row(N, lo, r):
+    # local row r of the block starting at pair lo; pair p holds rows p and
+    # N-1-p, which together have N-1 columns j > i to compare against
+    p = lo + r // 2
+    return p if r % 2 == 0 else N - 1 - p
+
+@njit(parallel=True, cache=True)
+def _emit_pairs(above, counts, lo):
+    N = above.shape[1]
+    offsets = np.zeros(len(counts) + 1, dtype=np.intp)
+    offsets[1:] = np.cumsum(counts)
+    rows = np.empty(offsets[-1], dtype=np.intp)
+    cols = np.empty(offsets[-1], dtype=np.intp)
+    for r in prange(len(counts)):
+        i = _block_row(N, lo, r)
+        k = offsets[r]
+        for j in range(i+1, N):
+            if above[r, j]:
+                rows[k] = i
+                cols[k] = j
+                k += 1
+    return rows, cols
+
+@njit(parallel=True, cache=True)
+def _fuse_kernel(A, t, simfn, lo, hi):
+    N = A.shape[0]
+    above = np.zeros((2 * (hi - lo), N), dtype=np.bool_)
+    counts = np.zeros(2 * (hi - lo), dtype=np.intp)
+    for r in prange(2 * (hi - lo)):
+        i = _block_row(N, lo, r)
+        # the middle row of an odd N is its own pair
+        if r % 2 == 1 and i == lo + r // 2:
+            continue
+        for j in range(i+1, N):
+            if simfn(A[i], A[j]) > t:
+                above[r, j] = True
+                counts[r] += 1
+    return _emit_pairs(above, counts, lo)
+
+@njit([_cfunc_kernel_signature(types.float64), _cfunc_kernel_signature(types.int64)],
+      parallel=True, cache=True)
+def _fuse_cfunc_kernel(A, t, simfn, lo, hi):
+    N, d = A.shape
+    above = np.zeros((2 * (hi - lo), N), dtype=np.bool_)
+    counts = np.zeros(2 * (hi - lo), dtype=np.intp)
+    for r in prange(2 * (hi - lo)):
+        i = _block_row(N, lo, r)
+        if r % 2 == 1 and i == lo + r // 2:
+            continue
+        for j in range(i+1, N):
+            if simfn(A[i].ctypes, A[j].ctypes, d) > t:
+                above[r, j] = True
+                counts[r] += 1
+    return _emit_pairs(above, counts, lo)
+
+def fuse_numba(t, attributes, node_ids, simfn, *graphs, budget=2**25):
+    """
+    fuses the graphs using a compiled similarity function over node attributes
+
+    rows are compared in blocks whose comparisons are held as one byte each,
+    at most `budget` bytes at a time; the block's pairs above t are then 
+    written out as edges. each block pairs row i with row N-1-i, so that every
+    thread compares the same number of pairs
+
+    args:
+        :t (float) - threshold value
+        :attributes (array-like) - (N, d) numeric array whose rows describe each node
+        :node_ids (sequence) - the N nodes corresponding to the rows of `attributes`
+        :simfn (numba.njit or numba.cfunc function) - determines the similarity between
+                two rows of `attributes`; assumed symmetric
+        :*graphs some number of (nx.Graph) - members of 𝒢
+        :budget (int) - bytes of comparisons held at once
+    returns:
+        :(nx.Graph) the fused graph
+    raises:
+        :ValueError if `attributes` and `node_ids` differ in length, or `simfn`
+            is a cfunc over rows that are neither float64 nor int64
+    """
+    node_ids = list(node_ids)
+    if len(attributes) != len(node_ids):
+        raise ValueError("got {0} attribute rows for {1} nodes".format(len(attributes), len(node_ids)))
+
+    if hasattr(simfn, 'ctypes'):
+        # a cfunc; its first argument points to the attribute dtype
+        dtype = np.dtype(simfn.ctypes.argtypes[0]._type_)
+        if dtype not in _CFUNC_DTYPES:
+            raise ValueError("cfunc similarity functions must take float64 or int64 rows, got {0}".format(dtype))
+        A = np.ascontiguousarray(attributes, dtype=dtype)
+        kernel, simfn = _fuse_cfunc_kernel, simfn.ctypes
+    else:
+        A = np.ascontiguousarray(attributes)
+        kernel = _fuse_kernel
+
+    N = len(A)
+    # each pair of rows takes 2N bytes of comparisons
+    n_pairs, step = (N + 1) // 2, max(1, budget // max(1, 2 * N))
+    rows, cols = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)]
+    for lo in range(0, n_pairs, step):
+        r, c = kernel(A, float(t), simfn, lo, min(lo + step, n_pairs))
+        rows.append(r)
+        cols.append(c)
+    return _graph_from_pairs(node_ids, np.concatenate(rows), np.concatenate(cols), graphs)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+numba-compiled union-find (disjoint set) structure for labeling the connected
+components of large fused graphs directly from their edge lists.
+
+`parallel_components` splits the edge list into shards, builds one `UnionFind`
+per shard in its own thread (the compiled kernels release the GIL) and merges
+the resulting structures pairwise.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from numba import njit
+__all__ = ["UnionFind", "parallel_components"]
+
+
+@njit(cache=True, nogil=True)
+def _find(parent, i):
+    root = i
+    while parent[root] != root:
+        root = parent[root]
+    # path compression
+    while parent[i] != root:
+        nxt = parent[i]
+        parent[i] = root
+        i = nxt
+    return root
+
+@njit(cache=True, nogil=True)
+def _union(parent, rank, i, j):
+    ri = _find(parent, i)
+    rj = _find(parent, j)
+    if ri == rj:
+        return
+    # union by rank
+    if rank[ri] < rank[rj]:
+        ri, rj = rj, ri
+    parent[rj] = ri
+    if rank[ri] == rank[rj]:
+        rank[ri] += 1
+
+@njit(cache=True, nogil=True)
+def _union_edges(parent, rank, rows, cols):
+    for k in range(rows.shape[0]):
+        _union(parent, rank, rows[k], cols[k])
+
+@njit(cache=True, nogil=True)
+def _merge(parent, rank, other_parent):
+    for i in range(other_parent.shape[0]):
+        _union(parent, rank, i, _find(other_parent, i))
+
+@njit(cache=True, nogil=True)
+def _roots(parent):
+    roots = np.empty_like(parent)
+    for i in range(parent.shape[0]):
+        roots[i] = _find(parent, i)
+    return roots
+
+class UnionFind:
+    """
+    disjoint sets over the integers 0..n-1 with path compression
+    and union by rank
+    """
+    def __init__(self, n):
+        """
+        constructs n singleton sets
+
+        args:
+            :n (int) - number of elements
+        """
+        self.parent = np.arange(n, dtype=np.int32)
+        self.rank = np.zeros(n, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.parent)
+
+    def find(self, i):
+        """
+        returns the representative of the set containing i
+        """
+        return int(_find(self.parent, i))
+
+    def union(self, i, j):
+        """
+        merges the sets containing i and j
+        """
+        _union(self.parent, self.rank, i, j)
+
+    def union_edges(self, rows, cols):
+        """
+        merges the sets containing rows[k] and cols[k] for every k
+        """
+        _union_edges(self.parent, self.rank, np.asarray(rows), np.asarray(cols))
+
+    def merge(self, other):
+        """
+        merges every pair of elements that are in the same set of `other`,
+        a UnionFind over the same elements
+        """
+        _merge(self.parent, self.rank, other.parent)
+
+    def labels(self):
+        """
+        returns:
+            :(int) number of sets
+            :(np.ndarray) set id of each element, numbered 0..(number of sets - 1)
+        """
+        roots, labels = np.unique(_roots(self.parent), return_inverse=True)
+        return len(roots), labels
+
+def parallel_components(n, rows, cols, n_jobs=-1):
+    """
+    label the connected components of the undirected graph on n nodes
+    with edges (rows[k], cols[k]) using one union-find per thread
+
+    args:
+        :n (int) - number of nodes
+        :rows, cols (np.ndarray) - endpoints of each edge
+        :n_jobs (int) - number of threads; all cpus for n_jobs = -1
+    returns:
+        :(int) number of components
+        :(np.ndarray) component id of each node
+    """
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    rows, cols = np.asarray(rows), np.asarray(cols)
+    bounds = np.linspace(0, len(rows), n_jobs + 1).astype(int)
+    shards = [UnionFind(n) for _ in range(n_jobs)]
+
+    with ThreadPoolExecutor(n_jobs) as pool:
+        list(pool.map(lambda k: shards[k].union_edges(rows[bounds[k]:bounds[k+1]],
+                                                      cols[bounds[k]:bounds[k+1]]),
+                      range(n_jobs)))
+        # merge disjoint pairs of shards until one remains
+        while len(shards) > 1:
+            list(pool.map(lambda k: shards[k].merge(shards[k+1]), range(0, len(shards) - 1, 2)))
+            shards = shards[::2]
+
+    return shards[0].labels()
@@ -3,10 +3,19 @@
 
 import setuptools
 
+try:
+    from Cython.Build import cythonize
+    # optional compiled thresholding of similarity tiles; see netfuses/_threshold.pyx
+    ext_modules = cythonize([setuptools.Extension("netfuses._threshold", ["netfuses/_threshold.pyx"])])
+except ImportError:
+    ext_modules = []
+
 setuptools.setup(name="netfuses",
                  version="1.0",
                  author="baglab",
                  description="fuse similar yet distinct nodes in a network",
                  packages=setuptools.find_packages(),
-                 install_requires=["networkx==1.11"]
+                 install_requires=["networkx>=2.5", "numpy", "scipy"],
+                 extras_require={"numba": ["numba>=0.53"], "torch": ["torch"], "cupy": ["cupy"]},
+                 ext_modules=ext_modules
                  )
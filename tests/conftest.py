@@ -0,0 +1,20 @@
+import random
+
+import networkx as nx
+import pytest
+
+
+def edge_set(G):
+    """undirected edges of G, self loops included, as a set of frozensets"""
+    return {frozenset(e) for e in G.edges()}
+
+
+@pytest.fixture
+def word_graphs():
+    """three small graphs of short words, many of which share letters"""
+    rng = random.Random(0)
+    words = [''.join(rng.choice('abcde') for _ in range(3)) for _ in range(120)]
+    g1 = nx.Graph(list(zip(words[::2], [w.upper() for w in words[1::2]])))
+    g2 = nx.DiGraph(list(zip(words[1::3], words[2::3])))
+    g3 = nx.MultiGraph(list(zip(words[::5], words[3::5])))
+    return g1, g2, g3
@@ -0,0 +1,93 @@
+from collections import Counter
+
+import networkx as nx
+import pytest
+
+import netfuses as nf
+
+
+def same_letters(u, v):
+    return 1.0 if u.lower() == v.lower() else 0.0
+
+def reference_collapse(fuser, *graphs):
+    """
+    the original node-by-node collapse, as multisets of 
+    (unordered) edges between fused node sets
+    """
+    node2set = {u: frozenset(c) for c in nx.connected_components(fuser) for u in c}
+    edges = Counter()
+    for component in set(node2set.values()):
+        for node in component:
+            for Gi in graphs:
+                if node not in Gi:
+                    continue
+                for n in Gi.neighbors(node):
+                    edges[frozenset((component, node2set[n]))] += 1
+                    if n in component:
+                        edges[frozenset((component,))] += 1
+    return edges, node2set
+
+def collapsed_edges(collapsed, weighted=False):
+    sets = {i: frozenset(s) for i, s in collapsed.nodes(data='fused_set')}
+    edges = Counter()
+    for i, j, w in collapsed.edges(data='weight', default=1):
+        edges[frozenset((sets[i], sets[j]))] += w if weighted else 1
+    return edges, sets
+
+@pytest.fixture
+def fused(word_graphs):
+    fuser = nf.NetworkFuser(same_letters, threshold=0.5)
+    return fuser, fuser.fuse(*word_graphs)
+
+
+def test_collapse_matches_reference(word_graphs, fused):
+    fuser, F = fused
+    collapsed, node2fuse_id = fuser.collapse(F, *word_graphs)
+    expected, node2set = reference_collapse(F, *word_graphs)
+    edges, sets = collapsed_edges(collapsed)
+    assert edges == expected
+    assert {u: sets[i] for u, i in node2fuse_id.items()} == node2set
+
+def test_component_ids_ordered_by_size(word_graphs, fused):
+    fuser, F = fused
+    collapsed, _ = fuser.collapse(F, *word_graphs)
+    sizes = [len(collapsed.nodes[i]['fused_set']) for i in range(len(collapsed))]
+    assert sizes == sorted(sizes)
+
+def test_collapse_mixed_node_labels():
+    graphs = nx.Graph([(1, "a"), ("A", (2, 3))]), nx.Graph([("a", 1.5), ((2, 3), 1)])
+    fuser = nf.NetworkFuser(lambda u, v: float(str(u).lower() == str(v).lower()), threshold=0.5)
+    F = fuser.fuse(*graphs)
+    collapsed, node2fuse_id = fuser.collapse(F, *graphs)
+    expected, node2set = reference_collapse(F, *graphs)
+    edges, sets = collapsed_edges(collapsed)
+    assert edges == expected
+    assert {u: sets[i] for u, i in node2fuse_id.items()} == node2set
+
+def test_weighted_collapse_preserves_multiplicity(word_graphs, fused):
+    fuser, F = fused
+    expected, _ = reference_collapse(F, *word_graphs)
+    for target in (nx.MultiGraph(), nx.Graph()):
+        collapsed, _ = fuser.collapse(F, *word_graphs, collapsed=target, weighted=True)
+        assert not any(d > 1 for d in Counter(map(frozenset, collapsed.edges())).values())
+        assert collapsed_edges(collapsed, weighted=True)[0] == expected
+
+def test_simple_collapse_has_reference_edges(word_graphs, fused):
+    fuser, F = fused
+    expected, _ = reference_collapse(F, *word_graphs)
+    collapsed, _ = fuser.collapse(F, *word_graphs, collapsed=nx.Graph())
+    assert set(collapsed_edges(collapsed)[0]) == set(expected)
+
+def test_collapse_default_is_fresh_graph(word_graphs, fused):
+    fuser, F = fused
+    first, _ = fuser.collapse(F, *word_graphs)
+    second, _ = fuser.collapse(F, *word_graphs)
+    assert first is not second
+    assert first.number_of_edges() == second.number_of_edges()
+    assert nf.convert_graph(first) is not nf.convert_graph(second)
+
+def test_collapse_with_union_find(word_graphs, fused):
+    pytest.importorskip("numba")
+    fuser, F = fused
+    collapsed, _ = fuser.collapse(F, *word_graphs, n_jobs=2)
+    assert collapsed_edges(collapsed)[0] == reference_collapse(F, *word_graphs)[0]
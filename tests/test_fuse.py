@@ -0,0 +1,107 @@
+import pickle
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import netfuses as nf
+from conftest import edge_set
+
+
+def same_letters(u, v):
+    return 1.0 if u.lower() == v.lower() else 0.0
+
+def letter_jaccard(u, v):
+    a, b = set(u.lower()), set(v.lower())
+    return len(a & b) / len(a | b)
+
+def reference_fuse(simfn, t, *graphs):
+    union = set().union(*map(set, graphs))
+    G = nx.Graph()
+    G.add_edges_from((u, u) for u in union)
+    G.add_edges_from((u, v) for u in union for v in union if u != v and simfn(u, v) > t)
+    return G
+
+
+def test_fuse_connects_analogs():
+    fuser = nf.NetworkFuser(same_letters, threshold=0.5)
+    G = fuser.fuse(nx.Graph([("A", "b")]), nx.Graph([("a", "c")]))
+    assert edge_set(G) == {frozenset(e) for e in [("A", "A"), ("a", "a"), ("b", "b"),
+                                                  ("c", "c"), ("A", "a")]}
+
+@pytest.mark.parametrize("t", [0.0, 0.3, 0.5, 0.9])
+def test_fuse_matches_reference(word_graphs, t):
+    G = nf.NetworkFuser(letter_jaccard, threshold=t).fuse(*word_graphs)
+    assert edge_set(G) == edge_set(reference_fuse(letter_jaccard, t, *word_graphs))
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_parallel_fuse_matches_serial(word_graphs, backend):
+    fuser = nf.NetworkFuser(letter_jaccard, threshold=0.5)
+    assert edge_set(fuser.fuse(*word_graphs, n_jobs=2, backend=backend)) == \
+        edge_set(fuser.fuse(*word_graphs))
+
+def _always(u, v):
+    return 1.0
+
+def test_process_fuse_never_pairs_a_node_with_itself():
+    # ints above 256 are new objects after pickling to worker processes
+    fused = nf.NetworkFuser(_always, threshold=0.5).fuse(nx.path_graph(300), n_jobs=2,
+                                                         backend='process')
+    assert nx.number_of_selfloops(fused) == 300
+    assert fused.number_of_edges() == 300 + 300 * 299 // 2
+
+def test_fuse_rejects_unknown_backend(word_graphs):
+    with pytest.raises(ValueError):
+        nf.NetworkFuser(letter_jaccard).fuse(*word_graphs, n_jobs=2, backend='gpu')
+
+def test_cache_matches_uncached(word_graphs):
+    uncached = nf.NetworkFuser(letter_jaccard, threshold=0.5)
+    symmetric = nf.NetworkFuser(letter_jaccard, threshold=0.5, cache_size=10**5, symmetric=True)
+    assert edge_set(uncached.fuse(*word_graphs)) == edge_set(symmetric.fuse(*word_graphs))
+    symmetric.fuse(*word_graphs)
+    assert symmetric.similarity_func.cache_info().hits > 0
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_precompute_parallel_matches_serial(word_graphs, backend):
+    fuser = nf.NetworkFuser(letter_jaccard)
+    nodes, serial = fuser.precompute(*word_graphs, min_threshold=0.2)
+    parallel_nodes, parallel = fuser.precompute(*word_graphs, min_threshold=0.2, n_jobs=2,
+                                                backend=backend)
+    assert nodes == parallel_nodes
+    assert np.array_equal(serial, parallel)
+    assert (serial['u'] < serial['v']).all()
+    assert (np.diff(serial['sim']) <= 0).all()
+
+def test_precompute_labels_pairs_by_node(word_graphs):
+    nodes, edges = nf.NetworkFuser(letter_jaccard).precompute(*word_graphs, min_threshold=0.2)
+    assert all(sim == letter_jaccard(nodes[u], nodes[v]) for sim, u, v in edges.tolist())
+
+def test_precompute_keeps_each_pair_once():
+    G = nx.path_graph(300)
+    nodes, edges = nf.NetworkFuser(_always).precompute(G, n_jobs=2, backend='process')
+    assert sorted(nodes) == list(G)
+    assert len(edges) == 300 * 299 // 2
+
+@pytest.mark.parametrize("t", [0.0, 0.2, 0.5, 0.75, 1.0])
+def test_fuse_at_matches_fuse(word_graphs, t):
+    fuser = nf.NetworkFuser(letter_jaccard, threshold=t)
+    fuser.precompute(*word_graphs)
+    assert edge_set(fuser.fuse_at()) == edge_set(fuser.fuse(*word_graphs))
+
+def test_fuse_at_below_min_threshold(word_graphs):
+    fuser = nf.NetworkFuser(letter_jaccard)
+    fuser.precompute(*word_graphs, min_threshold=0.5)
+    fuser.fuse_at(0.5)
+    with pytest.raises(ValueError):
+        fuser.fuse_at(0.4)
+
+def test_fuse_at_requires_precompute():
+    with pytest.raises(ValueError):
+        nf.NetworkFuser(letter_jaccard).fuse_at(0.5)
+
+def test_precomputed_pairs_are_not_pickled():
+    fuser = nf.NetworkFuser(_always)
+    size = len(pickle.dumps(fuser))
+    fuser.precompute(nx.path_graph(300))
+    assert len(pickle.dumps(fuser)) == size
+    assert len(pickle.dumps(fuser._analogs)) < 1000
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import netfuses as nf
+from netfuses.gpu_backend import fuse_gpu
+from netfuses.netfuses import _normalize_rows
+from conftest import edge_set
+
+
+def torch_devices():
+    torch = pytest.importorskip("torch")
+    return ['cpu'] + (['cuda'] if torch.cuda.is_available() else [])
+
+def cupy_devices():
+    cp = pytest.importorskip("cupy")
+    try:
+        return list(range(cp.cuda.runtime.getDeviceCount()))
+    except cp.cuda.runtime.CUDARuntimeError:
+        return []
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).normal(size=(300, 8))
+
+def assert_matches_vectorized(fused, vectors, t):
+    # half precision similarities may only disagree within 1e-3 of t
+    expected = edge_set(nf.fuse_vectorized(t, vectors, range(len(vectors))))
+    X = _normalize_rows(vectors).astype(np.float64)
+    S = X @ X.T
+    assert set(fused) == set(range(len(vectors)))
+    assert all(len(pair) == 2 and abs(S[tuple(pair)] - t) < 1e-3
+               for pair in edge_set(fused) ^ expected)
+
+
+@pytest.mark.parametrize("t", [-0.2, 0.4, 0.9])
+@pytest.mark.parametrize("block_size", [37, 300, 8192])
+def test_torch_matches_vectorized(vectors, t, block_size):
+    for device in torch_devices():
+        fused = fuse_gpu(t, vectors, range(len(vectors)), backend='torch',
+                         block_size=block_size, device=device)
+        assert_matches_vectorized(fused, vectors, t)
+
+@pytest.mark.parametrize("t", [-0.2, 0.4, 0.9])
+@pytest.mark.parametrize("block_size", [37, 300, 8192])
+def test_cupy_matches_vectorized(vectors, t, block_size):
+    devices = cupy_devices()
+    if not devices:
+        pytest.skip("no CUDA device")
+    for device in devices:
+        fused = fuse_gpu(t, vectors, range(len(vectors)), backend='cupy',
+                         block_size=block_size, device=device)
+        assert_matches_vectorized(fused, vectors, t)
+
+def test_invalid_arguments(vectors):
+    with pytest.raises(ValueError):
+        fuse_gpu(0.4, vectors, range(3), device='cpu')
+    with pytest.raises(ValueError):
+        fuse_gpu(0.4, vectors, range(len(vectors)), backend='opencl')
@@ -0,0 +1,61 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+numba = pytest.importorskip("numba")
+from numba import carray, cfunc, njit, types
+
+import netfuses as nf
+from netfuses import numba_backend
+from conftest import edge_set
+
+
+@njit
+def matching_fraction(a, b):
+    same = 0
+    for i in range(a.shape[0]):
+        if a[i] == b[i]:
+            same += 1
+    return same / a.shape[0]
+
+@cfunc(numba_backend.cfunc_signature(types.int64))
+def matching_fraction_cfunc(a, b, n):
+    x, y = carray(a, n), carray(b, n)
+    same = 0
+    for i in range(n):
+        if x[i] == y[i]:
+            same += 1
+    return same / n
+
+@pytest.fixture
+def attributes():
+    return np.random.default_rng(0).integers(0, 3, size=(150, 3))
+
+
+@pytest.mark.parametrize("simfn", [matching_fraction, matching_fraction_cfunc])
+@pytest.mark.parametrize("n", [1, 2, 149, 150])
+@pytest.mark.parametrize("budget", [1, 1000, 2**25])
+def test_fuse_numba_matches_network_fuser(attributes, simfn, n, budget):
+    attributes = attributes[:n]
+    ids = ["n{0}".format(i) for i in range(len(attributes))]
+    rows = dict(zip(ids, attributes))
+    expected = nf.NetworkFuser(lambda u, v: np.mean(rows[u] == rows[v]), threshold=0.5)
+    fused = numba_backend.fuse_numba(0.5, attributes, ids, simfn, budget=budget)
+    assert edge_set(fused) == edge_set(expected.fuse(nx.empty_graph(ids)))
+
+def test_unsupported_cfunc_dtype(attributes):
+    with pytest.raises(ValueError):
+        numba_backend.cfunc_signature(types.float32)
+
+    ptr = types.CPointer(types.float32)
+
+    @cfunc(types.float64(ptr, ptr, types.intp))
+    def constant(a, b, n):
+        return 1.0
+
+    with pytest.raises(ValueError):
+        numba_backend.fuse_numba(0.5, attributes, range(len(attributes)), constant)
+
+def test_length_mismatch(attributes):
+    with pytest.raises(ValueError):
+        numba_backend.fuse_numba(0.5, attributes, range(3), matching_fraction)
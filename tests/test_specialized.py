@@ -0,0 +1,69 @@
+import pickle
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import netfuses as nf
+from conftest import edge_set
+
+
+@pytest.mark.parametrize("t", [-0.5, 0.0, 0.5, 1.0])
+def test_exact_matches_generic(word_graphs, t):
+    nodes = set().union(*map(set, word_graphs))
+    labels = {u: u.lower()[:2] for u in list(nodes)[:-5]}
+    same = lambda u, v: float(u in labels and v in labels and labels[u] == labels[v])
+    expected = nf.NetworkFuser(same, threshold=t).fuse(*word_graphs)
+    fused = nf.NetworkFuser('exact', threshold=t).fuse(*word_graphs, labels=labels)
+    assert set(fused) == set(expected)
+    assert edge_set(fused) == edge_set(expected)
+
+@pytest.mark.parametrize("t", [-0.1, 0.0, 0.2, 1 / 3, 0.5, 1.0])
+def test_jaccard_matches_generic(word_graphs, t):
+    neighbors = {}
+    for G in word_graphs:
+        for u, nbrs in G.adjacency():
+            neighbors.setdefault(u, set()).update(nbrs)
+
+    def jaccard(u, v):
+        union = neighbors[u] | neighbors[v]
+        return len(neighbors[u] & neighbors[v]) / len(union) if union else 0.0
+
+    expected = nf.NetworkFuser(jaccard, threshold=t).fuse(*word_graphs)
+    fused = nf.NetworkFuser('jaccard', threshold=t).fuse(*word_graphs)
+    assert edge_set(fused) == edge_set(expected)
+
+@pytest.mark.parametrize("t", [0.0, 0.6])
+def test_cosine_matches_generic(word_graphs, t):
+    nodes = sorted(set().union(*map(set, word_graphs)))
+    rng = np.random.default_rng(0)
+    vectors = {u: rng.normal(size=4) for u in nodes[:-5]}
+
+    def cosine(u, v):
+        if u not in vectors or v not in vectors:
+            return -2.0
+        a, b = vectors[u], vectors[v]
+        return a @ b / np.linalg.norm(a) / np.linalg.norm(b)
+
+    expected = nf.NetworkFuser(cosine, threshold=t).fuse(*word_graphs)
+    fused = nf.NetworkFuser('cosine', threshold=t).fuse(*word_graphs, vectors=vectors)
+    assert set(fused) == set(expected)
+    assert edge_set(fused) == edge_set(expected)
+
+def test_cosine_without_vectors():
+    fused = nf.NetworkFuser('cosine', threshold=0.5).fuse(nx.Graph([(1, 2)]), vectors={})
+    assert edge_set(fused) == {frozenset([1]), frozenset([2])}
+
+def test_specialized_fuser_pickles(word_graphs):
+    fuser = pickle.loads(pickle.dumps(nf.NetworkFuser('jaccard', threshold=0.2)))
+    assert edge_set(fuser.fuse(*word_graphs)) == \
+        edge_set(nf.NetworkFuser('jaccard', threshold=0.2).fuse(*word_graphs))
+
+@pytest.mark.parametrize("kwargs", [{}, {'cache_size': 10}, {'symmetric': True}])
+def test_invalid_named_fusers(kwargs):
+    with pytest.raises(ValueError):
+        nf.NetworkFuser('levenshtein' if not kwargs else 'cosine', **kwargs)
+
+def test_named_precompute_is_rejected(word_graphs):
+    with pytest.raises(ValueError):
+        nf.NetworkFuser('exact').precompute(*word_graphs)
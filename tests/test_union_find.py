@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("numba")
+
+from netfuses.netfuses import _components
+from netfuses.union_find import UnionFind, parallel_components
+
+
+def same_partition(a, b):
+    return len(set(zip(a.tolist(), b.tolist()))) == len(set(a.tolist())) == len(set(b.tolist()))
+
+@pytest.fixture
+def edges():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 2000, 1500), rng.integers(0, 2000, 1500)
+
+
+def test_union_find():
+    uf = UnionFind(5)
+    uf.union(0, 3)
+    uf.union_edges(np.array([3, 1]), np.array([4, 1]))
+    assert uf.find(0) == uf.find(4)
+    assert uf.find(1) != uf.find(0)
+    n_comp, labels = uf.labels()
+    assert n_comp == 3
+    assert labels[0] == labels[3] == labels[4]
+
+def test_merge():
+    a, b = UnionFind(4), UnionFind(4)
+    a.union(0, 1)
+    b.union(1, 2)
+    a.merge(b)
+    assert a.find(0) == a.find(2) != a.find(3)
+
+@pytest.mark.parametrize("n_jobs", [1, 3, -1])
+def test_parallel_components_match_scipy(edges, n_jobs):
+    rows, cols = edges
+    n_comp, labels = _components(2000, rows, cols)
+    n_comp_uf, labels_uf = parallel_components(2000, rows, cols, n_jobs=n_jobs)
+    assert n_comp_uf == n_comp
+    assert same_partition(labels, labels_uf)
@@ -0,0 +1,113 @@
+import tracemalloc
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import netfuses as nf
+from netfuses.netfuses import _QuantizedRows, _normalize_rows, _threshold_pairs, _top_k_pairs
+from conftest import edge_set
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).normal(size=(300, 8))
+
+def reference_pairs(X, t):
+    S = _normalize_rows(X) @ _normalize_rows(X).T
+    return {frozenset(p) for p in zip(*np.nonzero(np.triu(S > t, 1)))}
+
+def reference_top_k(X, t, k):
+    S = _normalize_rows(X) @ _normalize_rows(X).T
+    np.fill_diagonal(S, -np.inf)
+    pairs = set()
+    for i, row in enumerate(S):
+        pairs.update(frozenset((i, j)) for j in np.argsort(-row)[:k] if row[j] > t)
+    return pairs
+
+
+@pytest.mark.parametrize("t", [-0.2, 0.3, 0.8])
+def test_fuse_vectorized_matches_network_fuser(vectors, t):
+    ids = ["n{0}".format(i) for i in range(len(vectors))]
+    vec = dict(zip(ids, vectors))
+    cosine = lambda u, v: vec[u] @ vec[v] / np.linalg.norm(vec[u]) / np.linalg.norm(vec[v])
+    G = nx.Graph(list(zip(ids[::2], ids[1::2])))
+    expected = nf.NetworkFuser(cosine, threshold=t).fuse(G)
+    fused = nf.fuse_vectorized(t, vectors, ids, G)
+    assert set(fused) == set(expected)
+    assert edge_set(fused) == edge_set(expected)
+
+def test_fuse_vectorized_adds_graph_nodes_without_vectors(vectors):
+    fused = nf.fuse_vectorized(0.5, vectors, range(len(vectors)), nx.Graph([("x", 0)]))
+    assert edge_set(fused.subgraph(["x"])) == {frozenset(["x"])}
+    assert fused.degree("x") == 2
+
+@pytest.mark.parametrize("block_size", [1, 37, 1024])
+def test_tiles_match_full_matrix(vectors, block_size):
+    rows, cols = _threshold_pairs(_normalize_rows(vectors), 0.4, block_size=block_size)
+    assert (rows < cols).all()
+    assert {frozenset(p) for p in zip(rows, cols)} == reference_pairs(vectors, 0.4)
+
+@pytest.mark.parametrize("k", [1, 5, 299])
+@pytest.mark.parametrize("budget", [1, 64 * 300 * 12, 2**25])
+def test_top_k_matches_reference(vectors, k, budget):
+    rows, cols = _top_k_pairs(_normalize_rows(vectors), 0.2, k, budget=budget, block_size=64)
+    assert {frozenset(p) for p in zip(rows, cols)} == reference_top_k(vectors, 0.2, k)
+
+def test_top_k_memory_is_bounded():
+    X = _normalize_rows(np.random.default_rng(0).normal(size=(5000, 8)))
+    tracemalloc.start()
+    _top_k_pairs(X, 0.5, 5, budget=2**20)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < 4 * 2**20
+
+def test_large_k_is_threshold(vectors):
+    ids = range(len(vectors))
+    assert edge_set(nf.fuse_vectorized(0.4, vectors, ids, k=len(vectors))) == \
+        edge_set(nf.fuse_vectorized(0.4, vectors, ids))
+
+@pytest.mark.parametrize("k", [0, -1])
+def test_invalid_k(vectors, k):
+    with pytest.raises(ValueError):
+        nf.fuse_vectorized(0.4, vectors, range(len(vectors)), k=k)
+
+def test_length_mismatch(vectors):
+    with pytest.raises(ValueError):
+        nf.fuse_vectorized(0.4, vectors, range(3))
+
+def test_quantized_similarities_are_close(vectors):
+    X = _normalize_rows(vectors)
+    Q = _QuantizedRows(vectors, block_size=7)
+    assert Q.codes.dtype == np.int8
+    assert np.abs(Q[:] @ Q[:].T - X @ X.T).max() < 1e-2
+
+def test_quantized_fuse_differs_only_near_threshold(vectors):
+    t = 0.4
+    exact = edge_set(nf.fuse_vectorized(t, vectors, range(len(vectors))))
+    quantized = edge_set(nf.fuse_vectorized(t, vectors, range(len(vectors)), quantize=True))
+    X = _normalize_rows(vectors)
+    S = X @ X.T
+    assert all(abs(S[tuple(pair)] - t) < 1e-2 for pair in exact ^ quantized)
+
+def test_quantized_top_k_stays_above_threshold(vectors):
+    t = 0.4
+    X = _normalize_rows(vectors)
+    S = X @ X.T
+    fused = nf.fuse_vectorized(t, vectors, range(len(vectors)), k=5, quantize=True)
+    exact = nf.fuse_vectorized(t, vectors, range(len(vectors)), k=5)
+    assert all(S[u, v] > t - 1e-2 for u, v in fused.edges() if u != v)
+    assert abs(fused.number_of_edges() - exact.number_of_edges()) <= 0.05 * exact.number_of_edges()
+
+def test_cython_kernel_matches_numpy(vectors):
+    _threshold = pytest.importorskip("netfuses._threshold")
+    S = np.ascontiguousarray(_normalize_rows(vectors) @ _normalize_rows(vectors).T)
+    out_r = np.empty(S.size, dtype=np.intc)
+    out_c = np.empty(S.size, dtype=np.intc)
+    for upper in (False, True):
+        count = _threshold.emit_edges(S, 0.4, out_r, out_c, upper)
+        above = np.triu(S > 0.4, 1) if upper else S > 0.4
+        r, c = np.nonzero(above)
+        assert np.array_equal(out_r[:count], r) and np.array_equal(out_c[:count], c)
+    with pytest.raises(ValueError):
+        _threshold.emit_edges(S, 0.4, out_r[:10], out_c[:10], False)